@@ -1,6 +1,7 @@
 # cli.py
 
 from datetime import datetime
+from functools import lru_cache
 from modelo import (
     Clinica, Paciente, Medico, Especialidad,
     PacienteNoEncontradoException, MedicoNoEncontradoException,
@@ -9,10 +10,20 @@ from modelo import (
     MedicoNoDisponibleException, TurnoOcupadoException, RecetaInvalidaException
 )
 
+FORMATO_FECHA_HORA = "%d/%m/%Y %H:%M"
+
+
+@lru_cache(maxsize=1024)
+def parsear_fecha_hora(fecha_str: str) -> datetime:
+    """Parsea una fecha del lote; las repetidas se toman de una caché acotada."""
+    return datetime.strptime(fecha_str, FORMATO_FECHA_HORA)
+
+
 class ClinicaCLI:
-    def __init__(self):
+    def __init__(self, cargar_datos_iniciales: bool = True):
         self.clinica = Clinica()
-        self._cargar_datos_iniciales()
+        if cargar_datos_iniciales:
+            self._cargar_datos_iniciales()
 
     def _cargar_datos_iniciales(self):
         """Carga algunos datos de ejemplo para facilitar la prueba."""
@@ -122,7 +133,7 @@ class ClinicaCLI:
             matricula = input("Matrícula del médico: ")
             especialidad = input("Especialidad requerida: ")
             fecha_str = input("Fecha y hora del turno (dd/mm/aaaa HH:MM): ")
-            fecha_hora = datetime.strptime(fecha_str, "%d/%m/%Y %H:%M")
+            fecha_hora = datetime.strptime(fecha_str, FORMATO_FECHA_HORA)
             
             self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
             print("✔️  Turno agendado exitosamente.")
@@ -178,7 +189,106 @@ class ClinicaCLI:
         for medico in medicos:
             print(medico)
 
+    # --- Modo por lotes (no interactivo) ---
+
+    def ejecutar_lote(self, lineas, salida) -> int:
+        """
+        Ejecuta comandos de a uno por línea, con campos separados por ';'.
+        Escribe en `salida` un resultado JSON por comando y devuelve la
+        cantidad de comandos que fallaron.
+        """
+        import json
+
+        # Comando -> (función, cantidad de argumentos)
+        comandos = {
+            "agregar_paciente": (self._lote_agregar_paciente, 3),
+            "agregar_medico": (self._lote_agregar_medico, 2),
+            "agregar_especialidad": (self._lote_agregar_especialidad, 3),
+            "agendar_turno": (self._lote_agendar_turno, 4),
+            "emitir_receta": (self._lote_emitir_receta, 3),
+            "ver_historia_clinica": (self._lote_ver_historia_clinica, 1),
+        }
+        errores = 0
+        for numero, linea in enumerate(lineas, start=1):
+            linea = linea.strip()
+            # Se ignoran líneas vacías y comentarios
+            if not linea or linea.startswith("#"):
+                continue
+            nombre, *argumentos = [campo.strip() for campo in linea.split(";")]
+            resultado = {"linea": numero, "comando": nombre, "ok": True}
+            try:
+                if nombre not in comandos:
+                    raise ValueError(f"Comando desconocido: {nombre}")
+                comando, cantidad = comandos[nombre]
+                if len(argumentos) != cantidad:
+                    raise ValueError(f"'{nombre}' espera {cantidad} argumentos y recibió {len(argumentos)}.")
+                resultado["resultado"] = str(comando(*argumentos))
+            except (ValueError, PacienteNoEncontradoException, MedicoNoEncontradoException,
+                    PacienteYaRegistradoException, MedicoYaRegistradoException,
+                    MedicoNoDisponibleException, TurnoOcupadoException, RecetaInvalidaException) as e:
+                errores += 1
+                resultado["ok"] = False
+                resultado["error"] = type(e).__name__
+                resultado["mensaje"] = str(e)
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        return errores
+
+    def _lote_agregar_paciente(self, nombre, dni, fecha_nac):
+        paciente = Paciente(nombre, dni, fecha_nac)
+        self.clinica.agregar_paciente(paciente)
+        return paciente
+
+    def _lote_agregar_medico(self, nombre, matricula):
+        medico = Medico(nombre, matricula)
+        self.clinica.agregar_medico(medico)
+        return medico
+
+    def _lote_agregar_especialidad(self, matricula, tipo_esp, dias_str):
+        medico = self.clinica.obtener_medico_por_matricula(matricula)
+        especialidad = Especialidad(tipo_esp, [dia.strip() for dia in dias_str.split(',') if dia.strip()])
+        medico.agregar_especialidad(especialidad)
+        return medico
+
+    def _lote_agendar_turno(self, dni, matricula, especialidad, fecha_str):
+        fecha_hora = parsear_fecha_hora(fecha_str)
+        return self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+
+    def _lote_emitir_receta(self, dni, matricula, medicamentos_str):
+        medicamentos = [med.strip() for med in medicamentos_str.split(',') if med.strip()]
+        return self.clinica.emitir_receta(dni, matricula, medicamentos)
+
+    def _lote_ver_historia_clinica(self, dni):
+        return self.clinica.obtener_historia_clinica(dni)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import contextlib
+    import sys
+
+    parser = argparse.ArgumentParser(description="Sistema de gestión de la clínica.")
+    parser.add_argument("--lote", metavar="ARCHIVO", type=argparse.FileType("r", encoding="utf-8"),
+                        help="ejecuta los comandos del archivo sin menú ('-' para leer de la entrada estándar)")
+    parser.add_argument("--datos-ejemplo", action="store_true",
+                        help="carga los datos de ejemplo antes de ejecutar el lote (requiere --lote)")
+    opciones = parser.parse_args(argv)
+    if opciones.datos_ejemplo and opciones.lote is None:
+        parser.error("--datos-ejemplo solo puede usarse junto con --lote")
+
+    if opciones.lote is None:
+        cli = ClinicaCLI()
+        cli.ejecutar()
+        return 0
+
+    # Los mensajes de la carga inicial van a stderr para no mezclarse con la salida JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        cli = ClinicaCLI(cargar_datos_iniciales=opciones.datos_ejemplo)
+    try:
+        errores = cli.ejecutar_lote(opciones.lote, sys.stdout)
+    finally:
+        if opciones.lote is not sys.stdin:
+            opciones.lote.close()
+    return 1 if errores else 0
 
 if __name__ == "__main__":
-    cli = ClinicaCLI()
-    cli.ejecutar()
\ No newline at end of file
+    raise SystemExit(main())
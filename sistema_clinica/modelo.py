@@ -57,12 +57,13 @@ class Especialidad:
         self.__tipo = tipo
         # Guardamos los días en minúsculas para una comparación insensible a mayúsculas
         self.__dias = [dia.lower() for dia in dias]
+        self.__dias_set = set(self.__dias)
 
     def obtener_especialidad(self) -> str:
         return self.__tipo
 
     def verificar_dia(self, dia: str) -> bool:
-        return dia.lower() in self.__dias
+        return dia.lower() in self.__dias_set
 
     def __str__(self) -> str:
         dias_str = ", ".join(d.capitalize() for d in self.__dias)
@@ -76,6 +77,8 @@ class Medico:
         self.__nombre = nombre
         self.__matricula = matricula
         self.__especialidades = []
+        # Índice por nombre en minúsculas para validar turnos sin recorrer todas las especialidades
+        self.__especialidades_por_tipo = {}
 
     def agregar_especialidad(self, especialidad: Especialidad):
         # Evitar duplicados de especialidades
@@ -83,6 +86,8 @@ class Medico:
             if esp.obtener_especialidad() == especialidad.obtener_especialidad():
                 return
         self.__especialidades.append(especialidad)
+        tipo = especialidad.obtener_especialidad().lower()
+        self.__especialidades_por_tipo.setdefault(tipo, []).append(especialidad)
 
     def obtener_matricula(self) -> str:
         return self.__matricula
@@ -96,6 +101,12 @@ class Medico:
     def obtener_especialidades(self) -> list[Especialidad]:
         return self.__especialidades
 
+    def atiende_especialidad_en_dia(self, tipo: str, dia: str) -> bool:
+        for esp in self.__especialidades_por_tipo.get(tipo.lower(), []):
+            if esp.verificar_dia(dia):
+                return True
+        return False
+
     def __str__(self) -> str:
         especialidades_str = "; ".join(str(esp) for esp in self.__especialidades)
         if not especialidades_str:
@@ -143,12 +154,16 @@ class HistoriaClinica:
         self.__paciente = paciente
         self.__turnos = []
         self.__recetas = []
+        # Texto ya armado de la historia; se descarta al agregar turnos o recetas
+        self.__texto = None
 
     def agregar_turno(self, turno: Turno):
         self.__turnos.append(turno)
+        self.__texto = None
 
     def agregar_receta(self, receta: Receta):
         self.__recetas.append(receta)
+        self.__texto = None
 
     def obtener_turnos(self) -> list[Turno]:
         return self.__turnos.copy()
@@ -157,6 +172,11 @@ class HistoriaClinica:
         return self.__recetas.copy()
 
     def __str__(self) -> str:
+        if self.__texto is None:
+            self.__texto = self.__armar_texto()
+        return self.__texto
+
+    def __armar_texto(self) -> str:
         historia_str = f"--- Historia Clínica de {self.__paciente._Paciente__nombre} ---\n"
         
         historia_str += "\n>> Turnos Agendados:\n"
@@ -183,6 +203,8 @@ class Clinica:
         self.__pacientes = {}
         self.__medicos = {}
         self.__turnos = []
+        # Pares (matrícula, fecha_hora) ya ocupados, para detectar duplicados sin recorrer los turnos
+        self.__turnos_ocupados = set()
         self.__historias_clinicas = {}
 
     # --- Métodos de Registro y Acceso ---
@@ -229,6 +251,7 @@ class Clinica:
         nuevo_turno = Turno(paciente, medico, fecha_hora, especialidad_solicitada)
         
         self.__turnos.append(nuevo_turno)
+        self.__turnos_ocupados.add((matricula, fecha_hora))
         self.__historias_clinicas[dni].agregar_turno(nuevo_turno)
         return nuevo_turno
 
@@ -264,10 +287,7 @@ class Clinica:
         return matricula in self.__medicos
 
     def validar_turno_no_duplicado(self, matricula: str, fecha_hora: datetime.datetime) -> bool:
-        for turno in self.__turnos:
-            if turno.obtener_medico().obtener_matricula() == matricula and turno.obtener_fecha_hora() == fecha_hora:
-                return False
-        return True
+        return (matricula, fecha_hora) not in self.__turnos_ocupados
 
     def obtener_dia_semana_en_espanol(self, fecha_hora: datetime.datetime) -> str:
         dias = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
@@ -280,7 +300,4 @@ class Clinica:
         return None
 
     def validar_especialidad_en_dia(self, medico: Medico, especialidad_solicitada: str, dia_semana: str) -> bool:
-        for esp in medico.obtener_especialidades():
-            if esp.obtener_especialidad().lower() == especialidad_solicitada.lower() and esp.verificar_dia(dia_semana):
-                return True
-        return False
\ No newline at end of file
+        return medico.atiende_especialidad_en_dia(especialidad_solicitada, dia_semana)
\ No newline at end of file
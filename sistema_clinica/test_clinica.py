@@ -1,7 +1,14 @@
 # test_clinica.py
 
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from modelo import (
     Clinica, Paciente, Medico, Especialidad,
     PacienteNoEncontradoException, MedicoNoEncontradoException,
@@ -9,6 +16,44 @@ from modelo import (
     MedicoNoDisponibleException, TurnoOcupadoException,
     RecetaInvalidaException
 )
+from cli import ClinicaCLI, main, parsear_fecha_hora
+
+
+class ClinicaReferencia(Clinica):
+    """Clínica con las validaciones originales por recorrido de listas, usada como oráculo."""
+
+    def validar_turno_no_duplicado(self, matricula, fecha_hora):
+        for turno in self.obtener_turnos():
+            if turno.obtener_medico().obtener_matricula() == matricula and turno.obtener_fecha_hora() == fecha_hora:
+                return False
+        return True
+
+    def validar_especialidad_en_dia(self, medico, especialidad_solicitada, dia_semana):
+        for esp in medico.obtener_especialidades():
+            if (esp.obtener_especialidad().lower() == especialidad_solicitada.lower()
+                    and dia_semana.lower() in esp._Especialidad__dias):
+                return True
+        return False
+
+
+def historia_referencia(historia) -> str:
+    """Arma el texto de la historia clínica sin caché, como la versión original."""
+    historia_str = f"--- Historia Clínica de {historia._HistoriaClinica__paciente._Paciente__nombre} ---\n"
+    historia_str += "\n>> Turnos Agendados:\n"
+    turnos = historia.obtener_turnos()
+    if not turnos:
+        historia_str += "No hay turnos registrados.\n"
+    else:
+        for turno in sorted(turnos, key=lambda t: t.obtener_fecha_hora()):
+            historia_str += f"- {turno}\n"
+    historia_str += "\n>> Recetas Emitidas:\n"
+    recetas = historia.obtener_recetas()
+    if not recetas:
+        historia_str += "No hay recetas registradas.\n"
+    else:
+        for receta in recetas:
+            historia_str += f"- {receta}\n"
+    return historia_str
 
 
 class TestClinica(unittest.TestCase):
@@ -205,5 +250,334 @@ class TestClinica(unittest.TestCase):
         self.assertIn(turno, historia.obtener_turnos())
         self.assertIn(receta, historia.obtener_recetas())
 
+
+class TestClinicaCLILote(unittest.TestCase):
+
+    def setUp(self):
+        """Crea una CLI sin datos de ejemplo y un buffer para la salida del lote."""
+        self.cli = ClinicaCLI(cargar_datos_iniciales=False)
+        self.salida = io.StringIO()
+
+    def _resultados(self) -> list[dict]:
+        return [json.loads(linea) for linea in self.salida.getvalue().splitlines()]
+
+    def test_lote_sin_datos_iniciales(self):
+        """La CLI en modo lote arranca sin pacientes ni médicos."""
+        self.assertEqual(self.cli.clinica.obtener_pacientes(), [])
+        self.assertEqual(self.cli.clinica.obtener_medicos(), [])
+
+    def test_lote_ejecuta_comandos(self):
+        """Los comandos del lote se aplican a la clínica y reportan su resultado."""
+        lineas = [
+            "# comentario",
+            "agregar_paciente;Laura Nuñez;34567890;10/02/1989",
+            "agregar_medico;Roberto Sanchez;MP9999",
+            "agregar_especialidad;MP9999;Cardiología;lunes,miércoles",
+            "",
+            "agendar_turno;34567890;MP9999;Cardiología;16/06/2025 10:00",
+            "emitir_receta;34567890;MP9999;Aspirina, Paracetamol",
+        ]
+        errores = self.cli.ejecutar_lote(lineas, self.salida)
+        resultados = self._resultados()
+
+        self.assertEqual(errores, 0)
+        self.assertEqual([r["linea"] for r in resultados], [2, 3, 4, 6, 7])
+        self.assertTrue(all(r["ok"] for r in resultados))
+        self.assertEqual(len(self.cli.clinica.obtener_turnos()), 1)
+        historia = self.cli.clinica.obtener_historia_clinica("34567890")
+        self.assertEqual(len(historia.obtener_recetas()), 1)
+
+    def test_lote_reporta_errores_y_continua(self):
+        """Un comando fallido se informa con su excepción sin detener el lote."""
+        lineas = [
+            "agregar_paciente;Laura Nuñez;34567890;10/02/1989",
+            "agendar_turno;34567890;MP_FALSA;Cardiología;16/06/2025 10:00",
+            "agendar_turno;34567890;MP9999",
+            "comando_inexistente",
+            "agendar_turno;34567890;MP9999;Cardiología;fecha inválida",
+            "agregar_paciente;Laura Nuñez;34567890;10/02/1989",
+            "agregar_medico;Roberto Sanchez;MP9999",
+            "agregar_especialidad;MP9999;Cardiología; , ",
+        ]
+        errores = self.cli.ejecutar_lote(lineas, self.salida)
+        resultados = self._resultados()
+
+        self.assertEqual(errores, 6)
+        self.assertTrue(resultados[0]["ok"])
+        self.assertTrue(resultados[6]["ok"])
+        self.assertEqual(
+            [r["error"] for r in resultados[1:6] + resultados[7:]],
+            ["MedicoNoEncontradoException", "ValueError", "ValueError",
+             "ValueError", "PacienteYaRegistradoException", "ValueError"]
+        )
+        self.assertEqual(self.cli.clinica.obtener_medico_por_matricula("MP9999").obtener_especialidades(), [])
+
+    def _ejecutar_main(self, argumentos) -> int:
+        """Llama a main() capturando stdout en self.salida y descartando stderr."""
+        with contextlib.redirect_stdout(self.salida), contextlib.redirect_stderr(io.StringIO()):
+            return main(argumentos)
+
+    def test_main_lote_en_cualquier_orden(self):
+        """El modo por lotes se activa sin importar el orden ni la forma de las opciones."""
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", encoding="utf-8", delete=False) as archivo:
+            archivo.write("agendar_turno;30123456;MP1234;Cardiología;16/06/2025 10:00\n")
+        self.addCleanup(os.remove, archivo.name)
+
+        for argumentos in (["--datos-ejemplo", "--lote", archivo.name],
+                           [f"--lote={archivo.name}", "--datos-ejemplo"]):
+            with self.subTest(argumentos=argumentos):
+                self.salida = io.StringIO()
+                self.assertEqual(self._ejecutar_main(argumentos), 0)
+                resultados = self._resultados()
+                self.assertEqual(len(resultados), 1)
+                self.assertTrue(resultados[0]["ok"])
+
+    def test_main_lote_archivo_inexistente(self):
+        """Un archivo de lote inexistente se informa como error de argumentos."""
+        with self.assertRaises(SystemExit) as contexto:
+            self._ejecutar_main(["--lote", "/archivo/que/no/existe.txt"])
+        self.assertEqual(contexto.exception.code, 2)
+
+    def test_main_datos_ejemplo_sin_lote(self):
+        """--datos-ejemplo sin --lote se rechaza en lugar de abrir el menú interactivo."""
+        with self.assertRaises(SystemExit) as contexto:
+            self._ejecutar_main(["--datos-ejemplo"])
+        self.assertEqual(contexto.exception.code, 2)
+
+    def test_lote_parsea_cada_fecha_una_vez(self):
+        """Las fechas repetidas en un lote se parsean una sola vez."""
+        parsear_fecha_hora.cache_clear()
+        lineas = [
+            "agregar_paciente;Laura Nuñez;34567890;10/02/1989",
+            "agregar_medico;Roberto Sanchez;MP9999",
+            "agregar_especialidad;MP9999;Cardiología;lunes",
+            "agendar_turno;34567890;MP9999;Cardiología;16/06/2025 10:00",
+            "agendar_turno;34567890;MP9999;Cardiología;16/06/2025 10:00",
+            "agendar_turno;34567890;MP9999;Cardiología;16/06/2025 11:00",
+        ]
+        errores = self.cli.ejecutar_lote(lineas, self.salida)
+
+        self.assertEqual(errores, 1)
+        self.assertEqual(self._resultados()[4]["error"], "TurnoOcupadoException")
+        self.assertEqual(
+            [t.obtener_fecha_hora() for t in self.cli.clinica.obtener_turnos()],
+            [datetime(2025, 6, 16, 10, 0), datetime(2025, 6, 16, 11, 0)]
+        )
+        self.assertEqual(parsear_fecha_hora.cache_info().misses, 2)
+
+class TestClinicaDiferencial(unittest.TestCase):
+    """
+    Reproduce secuencias aleatorias (con semilla fija) de operaciones sobre la
+    clínica optimizada y sobre la de referencia, y verifica que devuelvan los
+    mismos resultados y las mismas excepciones. Además mide, sobre una clínica
+    grande, la aceleración de las operaciones que usan los índices; el resumen
+    se imprime solo si está definida la variable de entorno MOSTRAR_ACELERACION.
+    """
+
+    SEMILLAS = [1, 2, 3]
+    OPERACIONES_POR_SEMILLA = 1500
+    ESPECIALIDADES = ["Cardiología", "cardiología", "Pediatría", "Clínica", "Dermatología"]
+    DIAS = ["lunes", "Martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+
+    # Parámetros de la medición de rendimiento
+    MEDICOS_GRANDE = 50
+    PACIENTES_GRANDE = 500
+    TURNOS_GRANDE = 2000
+    CONSULTAS_POR_LOTE = 200
+    REPETICIONES = 4
+
+    @classmethod
+    def setUpClass(cls):
+        # Aceleración medida por tipo de operación: {operacion: referencia / optimizada}
+        cls.aceleraciones = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        # Solo se muestra a pedido: MOSTRAR_ACELERACION=1 python -m pytest -s
+        if not os.environ.get("MOSTRAR_ACELERACION"):
+            return
+        print("\n--- Aceleración por tipo de operación (referencia / optimizada) ---")
+        for operacion, aceleracion in sorted(cls.aceleraciones.items()):
+            print(f"{operacion}: {aceleracion:.2f}x")
+
+    def _ejecutar(self, clinica, funcion):
+        """Ejecuta la operación y devuelve (resultado, excepción)."""
+        try:
+            return funcion(clinica), None
+        except Exception as e:
+            return None, e
+
+    def _comparar(self, operacion, funcion, paso):
+        res_opt, err_opt = self._ejecutar(self.optimizada, funcion)
+        res_ref, err_ref = self._ejecutar(self.referencia, funcion)
+
+        contexto = f"paso {paso}: {operacion}"
+        self.assertEqual(type(err_opt), type(err_ref), contexto)
+        self.assertEqual(str(err_opt), str(err_ref), contexto)
+        self.assertEqual(str(res_opt), str(res_ref), contexto)
+        return res_ref, err_ref
+
+    def _horario_aleatorio(self, rng, matricula):
+        """
+        Devuelve (matrícula, fecha_hora): la mitad de las veces repite un turno ya
+        agendado, para que los choques de horario sean frecuentes.
+        """
+        turnos = self.referencia.obtener_turnos()
+        if turnos and rng.random() < 0.5:
+            turno = rng.choice(turnos)
+            return turno.obtener_medico().obtener_matricula(), turno.obtener_fecha_hora()
+        fecha_hora = datetime(2025, 6, 16, 8, 0) + timedelta(days=rng.randrange(7), minutes=30 * rng.randrange(4))
+        return matricula, fecha_hora
+
+    def _operacion_aleatoria(self, rng):
+        dni = str(rng.randrange(60))
+        matricula = f"MP{rng.randrange(12)}"
+        especialidad = rng.choice(self.ESPECIALIDADES)
+        opcion = rng.random()
+
+        if opcion < 0.1:
+            fecha_nac = f"{rng.randint(1, 28):02d}/01/1990"
+            return "agregar_paciente", lambda c: c.agregar_paciente(Paciente("Paciente " + dni, dni, fecha_nac))
+        if opcion < 0.15:
+            return "agregar_medico", lambda c: c.agregar_medico(Medico("Medico " + matricula, matricula))
+        if opcion < 0.25:
+            dias = rng.sample(self.DIAS, rng.randint(1, 3))
+            return "agregar_especialidad", lambda c: str(
+                c.obtener_medico_por_matricula(matricula).agregar_especialidad(Especialidad(especialidad, dias))
+            )
+        if opcion < 0.7:
+            matricula, fecha_hora = self._horario_aleatorio(rng, matricula)
+            return "agendar_turno", lambda c: c.agendar_turno(dni, matricula, especialidad, fecha_hora)
+        if opcion < 0.8:
+            matricula, fecha_hora = self._horario_aleatorio(rng, matricula)
+            return "validar_turno_no_duplicado", lambda c: c.validar_turno_no_duplicado(matricula, fecha_hora)
+        if opcion < 0.9:
+            medicamentos = rng.sample(["Aspirina", "Ibuprofeno", "Paracetamol"], rng.randint(0, 2))
+            return "emitir_receta", lambda c: c.emitir_receta(dni, matricula, medicamentos)
+        if opcion < 0.95:
+            return "historia_clinica", lambda c: (
+                historia_referencia(c.obtener_historia_clinica(dni)) if c is self.referencia
+                else str(c.obtener_historia_clinica(dni))
+            )
+        dia = rng.choice(self.DIAS)
+        return "validar_especialidad_en_dia", lambda c: c.validar_especialidad_en_dia(
+            c.obtener_medico_por_matricula(matricula), especialidad, dia
+        )
+
+    def test_secuencias_aleatorias_coinciden_con_referencia(self):
+        """La clínica optimizada se comporta igual que la implementación de referencia."""
+        for semilla in self.SEMILLAS:
+            with self.subTest(semilla=semilla):
+                rng = random.Random(semilla)
+                self.optimizada = Clinica()
+                self.referencia = ClinicaReferencia()
+                turnos_ocupados = horarios_repetidos = 0
+                for paso in range(self.OPERACIONES_POR_SEMILLA):
+                    operacion, funcion = self._operacion_aleatoria(rng)
+                    resultado, error = self._comparar(operacion, funcion, paso)
+                    turnos_ocupados += isinstance(error, TurnoOcupadoException)
+                    horarios_repetidos += operacion == "validar_turno_no_duplicado" and resultado is False
+
+                # La secuencia debe ejercitar de verdad la detección de turnos duplicados
+                self.assertGreaterEqual(turnos_ocupados, 50)
+                self.assertGreaterEqual(horarios_repetidos, 50)
+
+                self.assertEqual(
+                    [str(t) for t in self.optimizada.obtener_turnos()],
+                    [str(t) for t in self.referencia.obtener_turnos()]
+                )
+                for paciente in self.referencia.obtener_pacientes():
+                    dni = paciente.obtener_dni()
+                    self.assertEqual(
+                        str(self.optimizada.obtener_historia_clinica(dni)),
+                        historia_referencia(self.referencia.obtener_historia_clinica(dni))
+                    )
+
+
+    # ------------------- Medición de rendimiento -------------------
+
+    def _construir_clinica_grande(self, clinica):
+        """Carga médicos, pacientes y turnos deterministas; devuelve los turnos agendados."""
+        for i in range(self.MEDICOS_GRANDE):
+            medico = Medico(f"Medico {i}", f"MP{i}")
+            medico.agregar_especialidad(Especialidad("Pediatría", ["martes", "jueves"]))
+            medico.agregar_especialidad(Especialidad("Cardiología", ["lunes", "miércoles", "viernes"]))
+            clinica.agregar_medico(medico)
+        for i in range(self.PACIENTES_GRANDE):
+            clinica.agregar_paciente(Paciente(f"Paciente {i}", str(i), "01/01/1990"))
+        inicio = datetime(2025, 6, 16, 8, 0)  # Lunes
+        for i in range(self.TURNOS_GRANDE):
+            fecha_hora = inicio + timedelta(weeks=i // self.MEDICOS_GRANDE % 40, minutes=30 * (i // 2000))
+            clinica.agendar_turno(str(i % self.PACIENTES_GRANDE), f"MP{i % self.MEDICOS_GRANDE}",
+                                  "Cardiología", fecha_hora)
+
+    def _medir(self, operacion, preparar):
+        """
+        Mide un lote de consultas en cada clínica, alternando cuál corre primero y
+        quedándose con el mejor tiempo de cada una. `preparar(clinica)` arma los
+        argumentos fuera de la medición y devuelve una función sin argumentos que
+        ejecuta el lote y devuelve sus resultados.
+        """
+        mejores = {id(self.optimizada): float("inf"), id(self.referencia): float("inf")}
+        for repeticion in range(self.REPETICIONES):
+            orden = (self.optimizada, self.referencia)
+            if repeticion % 2:
+                orden = orden[::-1]
+            resultados = {}
+            for clinica in orden:
+                lote = preparar(clinica, repeticion)
+                inicio = time.perf_counter()
+                resultados[id(clinica)] = lote()
+                mejores[id(clinica)] = min(mejores[id(clinica)], time.perf_counter() - inicio)
+            self.assertEqual(resultados[id(self.optimizada)], resultados[id(self.referencia)], operacion)
+        self.aceleraciones[operacion] = mejores[id(self.referencia)] / mejores[id(self.optimizada)]
+
+    def test_aceleracion_sobre_clinica_grande(self):
+        """Los índices aceleran las consultas sin cambiar sus resultados en una clínica grande."""
+        self.optimizada = Clinica()
+        self.referencia = ClinicaReferencia()
+        self._construir_clinica_grande(self.optimizada)
+        self._construir_clinica_grande(self.referencia)
+
+        rng = random.Random(0)
+        inicio = datetime(2025, 6, 16, 8, 0)
+        consultas = [
+            (f"MP{rng.randrange(self.MEDICOS_GRANDE)}",
+             inicio + timedelta(days=rng.randrange(280), minutes=30 * rng.randrange(4)))
+            for _ in range(self.CONSULTAS_POR_LOTE)
+        ]
+        especialidades = [(f"MP{rng.randrange(self.MEDICOS_GRANDE)}", rng.choice(self.ESPECIALIDADES),
+                           rng.choice(self.DIAS)) for _ in range(self.CONSULTAS_POR_LOTE)]
+        dnis = [str(rng.randrange(self.PACIENTES_GRANDE)) for _ in range(self.CONSULTAS_POR_LOTE)]
+
+        def preparar_turno_no_duplicado(clinica, repeticion):
+            return lambda: [clinica.validar_turno_no_duplicado(m, f) for m, f in consultas]
+
+        def preparar_especialidad_en_dia(clinica, repeticion):
+            argumentos = [(clinica.obtener_medico_por_matricula(m), e, d) for m, e, d in especialidades]
+            return lambda: [clinica.validar_especialidad_en_dia(*a) for a in argumentos]
+
+        def preparar_historia_clinica(clinica, repeticion):
+            historias = [clinica.obtener_historia_clinica(dni) for dni in dnis]
+            if clinica is self.referencia:
+                return lambda: [historia_referencia(h) for h in historias]
+            return lambda: [str(h) for h in historias]
+
+        def preparar_agendar_turno(clinica, repeticion):
+            # Cada repetición usa horarios nuevos (un domingo) para que el turno sea válido
+            dia = datetime(2025, 6, 15, 8, 0) + timedelta(weeks=repeticion)
+            medico = Medico("Medico Guardia", f"GUARDIA{repeticion}")
+            medico.agregar_especialidad(Especialidad("Guardia", ["domingo"]))
+            clinica.agregar_medico(medico)
+            fechas = [dia + timedelta(minutes=i) for i in range(self.CONSULTAS_POR_LOTE // 2)]
+            return lambda: [str(clinica.agendar_turno(dnis[i], medico.obtener_matricula(), "Guardia", f))
+                            for i, f in enumerate(fechas)]
+
+        self._medir("validar_turno_no_duplicado", preparar_turno_no_duplicado)
+        self._medir("validar_especialidad_en_dia", preparar_especialidad_en_dia)
+        self._medir("historia_clinica", preparar_historia_clinica)
+        self._medir("agendar_turno", preparar_agendar_turno)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file